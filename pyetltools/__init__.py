@@ -1,8 +1,28 @@
 import logging
-logging.basicConfig(level=logging.DEBUG, format='%(message)s')
+import os
+import sys
+
 logger = logging.getLogger(__name__)
+
+
+def setup_logging(level=logging.WARNING):
+    # Opt-in replacement for the basicConfig call that used to run at import
+    # time and mutated global logging state for every consumer
+    logging.basicConfig(stream=sys.stdout, level=level, format='%(message)s')
+
+
+if os.environ.get("PYETLTOOLS_AUTOCONFIG_LOGGING") == "1":
+    setup_logging()
+
+
 def get_default_logger():
     return logger
 
 
-
+def __getattr__(name):
+    # PEP 562 lazy attribute: importing the core machinery pulls in the heavy
+    # connector stack, so defer it until pyetltools.connectors is accessed
+    if name == "connectors":
+        from pyetltools.core.env_manager import get_env_manager
+        return get_env_manager().connectors
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -83,9 +83,10 @@ class EnvManager:
 
     def get_connector(self,  environment=None , resource_type=None, resource_subtype=None, resource_sub_id=None):
         con_key = (resource_type, environment, resource_subtype, resource_sub_id)
-        if con_key not in self._resources:
+        connector = self._resources.get(con_key)
+        if connector is None:
             raise Exception("Connector not found for "+str(con_key))
-        return self._resources[con_key]
+        return connector
 
     def get_connectors(self):
         return self.connectors
@@ -122,9 +123,10 @@ class EnvManager:
     def get_connector_by_key(self, conn):
         if isinstance(conn, Connector):
             return conn
-        if conn not in self._connectors:
+        connector = self._connectors.get(conn)
+        if connector is None:
             raise Exception(f"Connector {conn} not found. Available connectors: " + str(list(self._connectors.keys())))
-        return self._connectors[conn]
+        return connector
 
     def get_default_cache(self):
         return self.get_connector_by_key("CACHE")
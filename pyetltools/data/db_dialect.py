@@ -1,22 +1,19 @@
 import urllib
-from abc import abstractmethod
 
 
+# Not an ABC on purpose: some dialects (e.g. NZDBDialect) implement only the
+# subset they support, so the base methods raise NotImplementedError when
+# called instead of enforcing the full interface at instantiation.  The
+# previous @abstractmethod decorators were never enforced (no ABCMeta) and
+# the stubs silently returned None.
 class DBDialect:
 
 
-    @abstractmethod
     def get_jdbc_subprotocol(self):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
-    def get_jdbc_conn_string(self):
-        pass
-
-
-    @abstractmethod
     def get_jdbc_conn_string(self, dsn, host, port, data_source, username, password_callback, odbc_driver, integrated_security):
-        pass
+        raise NotImplementedError
 
     # constructs odbc connection string in the form DSN=NZFTST2;DATABASE={database};UID={username}
     def get_odbc_conn_string(self, dsn, host, port, data_source, username, password_callback, odbc_driver, integrated_security, odbc_conn_options):
@@ -40,14 +37,11 @@ class DBDialect:
 
         return ret
 
-    @abstractmethod
     def get_sql_list_objects(self):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def get_sql_list_databases(self):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def get_select(self, limit_rows, table_name, where):
-        pass
+        raise NotImplementedError
@@ -10,8 +10,13 @@ import sqlalchemy.types as sqltypes
 from sqlalchemy.schema import DDLElement, SchemaItem
 from sqlalchemy.sql import text, bindparam
 import sqlalchemy.util as util
-import pyodbc
 import re
+import contextlib
+import functools
+import os
+import pickle
+import threading
+import time
 from sqlalchemy.ext.compiler import compiles
 import sqlalchemy.types as types
 
@@ -96,9 +101,6 @@ class NetezzaTypeCompiler(PGTypeCompiler):
     def visit_TEXT(self, _type):
         return 'NVARCHAR(100)'
 
-    def visit_TEXT(self, _type):
-        return 'NVARCHAR(100)'
-
     def visit_TIMESTAMP(self, _type):
         return 'TIMESTAMP'
 
@@ -138,6 +140,11 @@ class DistributeOn(SchemaItem):
         )
         '''
         self.column_names = column_names if column_names else ('RANDOM',)
+        # rendered once here so emitting DDL is a plain concatenation
+        if self.column_names[0].lower() == 'random':
+            self._rendered = 'RANDOM'
+        else:
+            self._rendered = '({})'.format(','.join(self.column_names))
 
     def _set_parent(self, parent):
         self.parent = parent
@@ -149,14 +156,13 @@ class NetezzaDDLCompiler(PGDDLCompiler):
 
     def post_create_table(self, table):
         '''Adds the `distribute on` clause to create table expressions'''
-        clause = ' DISTRIBUTE ON {columns}'
-        if hasattr(table, 'distribute_on') and \
-           table.distribute_on.column_names[0].lower() != 'random':
-            column_list = ','.join(table.distribute_on.column_names)
-            columns = '({})'.format(column_list)
-        else:
-            columns = 'RANDOM'
-        return clause.format(columns=columns)
+        distribute_on = getattr(table, 'distribute_on', None)
+        if distribute_on is not None:
+            return ' DISTRIBUTE ON ' + distribute_on._rendered
+        return ' DISTRIBUTE ON RANDOM'
+
+# Parses precision/scale out of format_type, e.g. 'NUMERIC(18,2)'
+_NUMERIC_RE = re.compile(r'numeric\((\d+),(\d+)\)', re.IGNORECASE)
 
 # Maps type ids to sqlalchemy types, plus whether they have variable precision
 oid_datatype_map = {
@@ -187,6 +193,173 @@ oid_datatype_map = {
 }
 
 
+# Reflection SQL built once at import: reusing the same text() constructs
+# lets SQLAlchemy's compiled-statement cache hit on every call instead of
+# recompiling a fresh object per reflection query
+_SQL_TABLE_NAMES = sql.text(
+    "select tablename as name from _v_table "
+    "where schema=:schema and tablename not like '_t_%'"
+).columns(relname=sqltypes.Unicode)
+
+_SQL_SCHEMA_NAMES = sql.text(
+    "select schema from _v_schema"
+    " ORDER BY schema"
+).columns(nspname=sqltypes.Unicode)
+
+_SQL_VIEW_NAMES = sql.text(
+    "select viewname as name from _v_view "
+    "where (schema = :schema or :schema is null) "
+    "and viewname not like '_v_%'"
+).columns(relname=sqltypes.Unicode)
+
+_COLS_TYPEMAP = {'tablename': NAME,
+                 'name': NAME,
+                 'typeid': sqltypes.Integer,
+                 'nullable': sqltypes.Boolean,
+                 'length': sqltypes.Integer,
+                 'format_type': sqltypes.String,
+                 'schema': sqltypes.String
+                 }
+
+_SQL_MULTI_COLS = text("""
+    SELECT a.name as tablename,
+           a.attname as name,
+           a.atttypid as typeid,
+           not a.attnotnull as nullable,
+           a.attcolleng as length,
+           a.format_type
+    FROM _v_relation_column a
+    WHERE a.schema=:schema
+    ORDER BY a.name, a.attnum
+""",
+                       bindparams=[bindparam('schema', type_=sqltypes.String)],
+                       typemap=_COLS_TYPEMAP)
+
+_SQL_PREFETCH = text("""
+    SELECT a.name as tablename,
+           a.attname as name,
+           a.atttypid as typeid,
+           not a.attnotnull as nullable,
+           a.attcolleng as length,
+           a.format_type
+    FROM _v_relation_column a
+    WHERE a.schema=:schema and a.type = 'TABLE'
+          and a.name not like '_t_%'
+    ORDER BY a.name, a.attnum
+""",
+                     bindparams=[bindparam('schema', type_=sqltypes.String)],
+                     typemap=_COLS_TYPEMAP)
+
+_SQL_TABLE_OID_WITH_SCHEMA = sql.text("""
+    SELECT * FROM _V_TABLE
+    WHERE schema = :schema
+    AND tablename = :table_name
+""").bindparams(
+    bindparam('table_name', type_=sqltypes.Unicode),
+    bindparam('schema', type_=sqltypes.Unicode),
+).columns(oid=sqltypes.Integer)
+
+_SQL_TABLE_OID = sql.text("""
+    SELECT * FROM _V_TABLE
+    WHERE tablename = :table_name
+""").bindparams(
+    bindparam('table_name', type_=sqltypes.Unicode),
+).columns(oid=sqltypes.Integer)
+
+
+def _build_column_type_factories():
+    '''Precomputes a typeid -> factory dispatch so the per-row reflection
+    loop does a single lookup instead of re-testing the type class.
+    The type oids are small bounded ints, so a sparse list indexed by
+    typeid beats hashing the key on every row.'''
+    factories = [None] * (max(oid_datatype_map) + 1)
+    for typeid, (coltype_class, has_length) in oid_datatype_map.items():
+        if coltype_class is sqltypes.Numeric:
+            def factory(length, format_type, _cls=coltype_class):
+                m = _NUMERIC_RE.match(format_type)
+                return _cls(int(m.group(1)), int(m.group(2)))
+        elif has_length:
+            def factory(length, format_type, _cls=coltype_class):
+                return _cls(length)
+        else:
+            def factory(length, format_type, _cls=coltype_class):
+                return _cls()
+        factories[typeid] = factory
+    return factories
+
+
+_column_type_factories = _build_column_type_factories()
+
+
+class _SchemaCache:
+    '''Stale-while-revalidate cache for schema/table name lists.
+
+    A fresh entry is served directly; a stale one is still served
+    immediately while a daemon thread re-queries on its own connection and
+    swaps the entry in, so callers never block on the refresh.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._refreshing = set()
+
+    def get(self, key, ttl, connection, fetch):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            names = fetch(connection)
+            self.put(key, names)
+            return names
+        timestamp, names = entry
+        if time.monotonic() - timestamp > ttl:
+            self._refresh_in_background(key, fetch, connection.engine)
+        return names
+
+    def put(self, key, names):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), names)
+
+    def _refresh_in_background(self, key, fetch, engine):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                with engine.connect() as conn:
+                    self.put(key, fetch(conn))
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=_refresh, daemon=True).start()
+
+
+_schema_names_cache = _SchemaCache()
+
+
+def _persistent_reflection_cache(fn):
+    '''Layers the opt-in cross-run cache (see NetezzaODBC.caching_schema)
+    on top of the per-Inspector @reflection.cache.'''
+    cached = reflection.cache(fn)
+
+    @functools.wraps(fn)
+    def wrapper(self, connection, *args, **kw):
+        cache = NetezzaODBC._global_reflection_cache
+        if cache is None:
+            return cached(self, connection, *args, **kw)
+        key = (fn.__name__,) + args + tuple(
+            sorted((k, v) for k, v in kw.items() if k != 'info_cache'))
+        if key in cache:
+            return cache[key]
+        result = cached(self, connection, *args, **kw)
+        cache[key] = result
+        return result
+    return wrapper
+
+
 class NetezzaODBC(PyODBCConnector, PGDialect):
     '''Attempts to reuse as much as possible from the postgresql and pyodbc
     dialects.
@@ -205,6 +378,33 @@ class NetezzaODBC(PyODBCConnector, PGDialect):
     ddl_compiler = NetezzaDDLCompiler
     description_encoding = None
 
+    # Opt-in cache shared by all inspectors while a caching_schema() block
+    # is active; per-Inspector @reflection.cache is discarded between runs
+    _global_reflection_cache = None
+
+    @classmethod
+    @contextlib.contextmanager
+    def caching_schema(cls, path=None):
+        '''Reuses reflection results across Inspector instances, optionally
+        persisted to a pickle file so repeated ETL runs skip re-reflecting
+        an unchanged schema:
+
+            with NetezzaODBC.caching_schema('/tmp/nz_reflect.pkl'):
+                meta.reflect(bind=engine)
+        '''
+        cache = {}
+        if path is not None and os.path.exists(path):
+            with open(path, 'rb') as f:
+                cache = pickle.load(f)
+        cls._global_reflection_cache = cache
+        try:
+            yield cache
+        finally:
+            cls._global_reflection_cache = None
+            if path is not None:
+                with open(path, 'wb') as f:
+                    pickle.dump(cache, f)
+
     def initialize(self, connection):
         super(NetezzaODBC, self).initialize(connection)
         # PyODBC connector tries to set these to true...
@@ -215,127 +415,165 @@ class NetezzaODBC(PyODBCConnector, PGDialect):
         self.encoding = 'latin9'
         self.ischema_names.update(ischema_names)
 
+    _dbname = None
+
     def has_table(self, connection, tablename, schema=None):
         '''Checks if the table exists in the current database'''
         # Have to filter by database name because the table could exist in
         # another database on the same machine
-        dbname = connection.connection.getinfo(pyodbc.SQL_DATABASE_NAME)
-        sql = ('select count(*) from _v_object_data where objname = ? '
-               'and dbname = ?')
-        result = connection.execute(sql, (str(tablename), dbname)).scalar()
-        return bool(result)
-
-    @reflection.cache
+        if self._dbname is None:
+            # deferred so importing the module (e.g. just to register the
+            # dialect) doesn't pay for pyodbc's C extension load
+            import pyodbc
+            # getinfo is a driver round trip - only do it once per dialect
+            self._dbname = connection.connection.getinfo(
+                pyodbc.SQL_DATABASE_NAME)
+        # LIMIT 1 short-circuits on the first match instead of aggregating
+        sql = ('select 1 from _v_object_data where objname = ? '
+               'and dbname = ? limit 1')
+        result = connection.execute(sql, (str(tablename), self._dbname)).scalar()
+        return result is not None
+
+    # Populated by _prefetch_schema; maps schema name to the
+    # table -> columns dict for that schema
+    _prefetched_schemas = None
+
+    def _prefetch_schema(self, connection, schema=None, **kw):
+        '''Hydrates table names and their columns for a whole schema with a
+        single query, so a subsequent get_table_names plus per-table
+        get_columns calls cost one round trip in total.'''
+        if self._prefetched_schemas is None:
+            self._prefetched_schemas = {}
+        key = schema if schema is not None else self.default_schema_name
+        if key not in self._prefetched_schemas:
+            c = connection.execute(_SQL_PREFETCH, schema=key)
+            columns_by_table = {}
+            # iterate the result directly - fetchall() would materialize the
+            # whole rowset a second time
+            for tablename, name, typeid, nullable, length, format_type in c:
+                columns_by_table.setdefault(tablename, []).append(
+                    self._column_info(name, typeid, nullable, length, format_type))
+            self._prefetched_schemas[key] = columns_by_table
+        return self._prefetched_schemas[key]
+
+    def _get_prefetched(self, schema):
+        if self._prefetched_schemas is None:
+            return None
+        key = schema if schema is not None else self.default_schema_name
+        return self._prefetched_schemas.get(key)
+
+    # Opt-in stale-while-revalidate caching of schema/table name lists;
+    # set to a number of seconds to enable
+    names_cache_ttl = None
+
+    @_persistent_reflection_cache
     def get_table_names(self, connection, schema=None, **kw):
-        result = connection.execute(
-            sql.text(
-                    "select tablename as name from _v_table "
-                    "where schema=:schema and tablename not like '_t_%'"
-            ).columns(relname=sqltypes.Unicode),
-            schema=schema if schema is not None else self.default_schema_name,
-        )
-        table_names = [r[0] for r in result]
-        return table_names
+        prefetched = self._get_prefetched(schema)
+        if prefetched is not None:
+            return list(prefetched)
 
+        def fetch(conn):
+            result = conn.execute(
+                _SQL_TABLE_NAMES,
+                schema=schema if schema is not None else self.default_schema_name,
+            )
+            return [r[0] for r in result]
 
-    @reflection.cache
-    def get_schema_names(self, connection, **kw):
-        result = connection.execute(
-            sql.text(
-                "select schema from _v_schema"
-                " ORDER BY schema"
-            ).columns(nspname=sqltypes.Unicode)
-        )
-        return [name for name, in result]
+        if self.names_cache_ttl is not None:
+            key = (str(connection.engine.url), 'table_names', schema)
+            return _schema_names_cache.get(
+                key, self.names_cache_ttl, connection, fetch)
+        return fetch(connection)
 
-    @reflection.cache
+
+    @_persistent_reflection_cache
+    def get_schema_names(self, connection, **kw):
+        def fetch(conn):
+            result = conn.execute(_SQL_SCHEMA_NAMES)
+            return [name for name, in result]
+
+        if self.names_cache_ttl is not None:
+            key = (str(connection.engine.url), 'schema_names', None)
+            return _schema_names_cache.get(
+                key, self.names_cache_ttl, connection, fetch)
+        return fetch(connection)
+
+    @_persistent_reflection_cache
+    def get_multi_columns(self, connection, schema=None, **kw):
+        '''Reflects all tables of a schema in a single round trip.
+
+        Returns a dict mapping table name to its column list.  Cached per
+        inspector, so a full-schema reflect issues one query instead of one
+        per table.
+        '''
+        c = connection.execute(
+            _SQL_MULTI_COLS,
+            schema=schema if schema is not None else self.default_schema_name)
+        columns_by_table = {}
+        for tablename, name, typeid, nullable, length, format_type in c:
+            columns_by_table.setdefault(tablename, []).append(
+                self._column_info(name, typeid, nullable, length, format_type))
+        return columns_by_table
+
+    @staticmethod
+    def _column_info(name, typeid, nullable, length, format_type):
+        return {
+            'name': name,
+            'type': _column_type_factories[typeid](length, format_type),
+            'nullable': nullable,
+        }
+
+    @_persistent_reflection_cache
     def get_columns(self, connection, table_name, schema=None, **kw):
-        SQL_COLS = """
-            SELECT --CAST(a.attname AS VARCHAR(128)) as name,
-                   a.attname as name,
-                   a.atttypid as typeid,
-                   not a.attnotnull as nullable,
-                   a.attcolleng as length,
-                   a.format_type
-            FROM _v_relation_column a
-            WHERE a.name = :tablename and a.schema=:schema
-            ORDER BY a.attnum
-        """
+        prefetched = self._get_prefetched(schema)
+        if prefetched is not None and table_name in prefetched:
+            return prefetched[table_name]
+        return self.get_multi_columns(connection, schema=schema, **kw).get(table_name, [])
 
-        s = text(SQL_COLS,
-                 bindparams=[bindparam('tablename', type_=sqltypes.String),
-                             bindparam('schema', type_=sqltypes.String)],
-                 typemap={'name': NAME,
-                          'typeid': sqltypes.Integer,
-                          'nullable': sqltypes.Boolean,
-                          'length': sqltypes.Integer,
-                          'format_type': sqltypes.String,
-                          'tablename': sqltypes.String,
-                          'schema': sqltypes.String
-                          })
-        c = connection.execute(s, tablename=table_name, schema=schema if schema is not None else self.default_schema_name)
-        rows = c.fetchall()
-        # format columns
-        columns = []
-        for name, typeid, nullable, length, format_type in rows:
-            coltype_class, has_length = oid_datatype_map[typeid]
-            if coltype_class is sqltypes.Numeric:
-                precision, scale = re.match(
-                    r'numeric\((\d+),(\d+)\)',format_type.lower()).groups()
-                coltype = coltype_class(int(precision), int(scale))
-            elif has_length:
-                coltype = coltype_class(length)
-            else:
-                coltype = coltype_class()
-            columns.append({
-                'name': name,
-                'type': coltype,
-                'nullable': nullable,
-            })
-        return columns
-
-    @reflection.cache
+    @_persistent_reflection_cache
     def get_pk_constraint(self, connection, table_name, schema=None, **kw):
         '''Netezza doesn't have PK/unique constraints'''
         return {'constrained_columns': [], 'name': None}
 
-    @reflection.cache
+    def get_multi_pk_constraint(self, connection, schema=None, **kw):
+        return {name: {'constrained_columns': [], 'name': None}
+                for name in self.get_table_names(connection, schema, **kw)}
+
+    def get_multi_foreign_keys(self, connection, schema=None, **kw):
+        return {name: [] for name in self.get_table_names(connection, schema, **kw)}
+
+    def get_multi_indexes(self, connection, schema=None, **kw):
+        return {name: [] for name in self.get_table_names(connection, schema, **kw)}
+
+    @_persistent_reflection_cache
     def get_unique_constraints(
             self, connection, table_name, schema=None, **kw
     ):
         # TODO
         return []
 
-    @reflection.cache
+    @_persistent_reflection_cache
     def get_check_constraints(self, connection, table_name, schema=None, **kw):
         return [];
 
-    @reflection.cache
+    @_persistent_reflection_cache
     def get_table_comment(self, connection, table_name, schema=None, **kw):
         # TODO
         return {"text": ""}
 
-    @reflection.cache
+    @_persistent_reflection_cache
     def get_foreign_keys(self, connection, table_name, schema=None, **kw):
         '''Netezza doesn't have foreign keys'''
         return []
 
-    @reflection.cache
+    @_persistent_reflection_cache
     def get_indexes(self, connection, table_name, schema=None, **kw):
         '''Netezza doesn't have indexes'''
         return []
 
-    @reflection.cache
+    @_persistent_reflection_cache
     def get_view_names(self, connection, schema=None, **kw):
-        if schema is not None:
-            schema_where_clause = "schema = :schema"
-        else:
-            schema_where_clause = "1=1"
-        result = connection.execute(
-            "select viewname as name from _v_view"
-            "where (%s) and viewname not like '_v_%'"
-            % schema_where_clause)
-
+        result = connection.execute(_SQL_VIEW_NAMES, schema=schema)
         return [r[0] for r in result]
 
     def get_isolation_level(self, connection):
@@ -348,7 +586,7 @@ class NetezzaODBC(PyODBCConnector, PGDialect):
         '''Netezza doesn't *do* unicode (except in nchar & nvarchar)'''
         pass
 
-    @reflection.cache
+    @_persistent_reflection_cache
     def get_table_oid(self, connection, table_name, schema=None, **kw):
         """Fetch the oid for schema.table_name.
 
@@ -357,29 +595,16 @@ class NetezzaODBC(PyODBCConnector, PGDialect):
         subsequent calls.
 
         """
-        table_oid = None
-        if schema is not None:
-            schema_where_clause = "schema = :schema"
-        else:
-            schema_where_clause = "1=1"
-        query = (
-                """
-                SELECT * FROM _V_TABLE
-                WHERE (%s)
-                AND tablename = :table_name 
-            """
-                % schema_where_clause
-        )
         # Since we're binding to unicode, table_name and schema_name must be
         # unicode.
         table_name = util.text_type(table_name)
         if schema is not None:
             schema = util.text_type(schema)
-        s = sql.text(query).bindparams(table_name=sqltypes.Unicode)
-        s = s.columns(oid=sqltypes.Integer)
-        if schema:
-            s = s.bindparams(sql.bindparam("schema", type_=sqltypes.Unicode))
-        c = connection.execute(s, table_name=table_name, schema=schema)
+            c = connection.execute(
+                _SQL_TABLE_OID_WITH_SCHEMA,
+                table_name=table_name, schema=schema)
+        else:
+            c = connection.execute(_SQL_TABLE_OID, table_name=table_name)
         table_oid = c.scalar()
         if table_oid is None:
             raise exc.NoSuchTableError(table_name)
@@ -13,27 +13,61 @@ def gen_insert(tablename, columns=None,df=None, rows=1):
         except Exception as e:
             return False
     if columns is not None:
-        values=[["'"+i+"'" for i in  columns]]
+        value_rows=[",\n".join(f"'{c}'" for c in columns)]
     elif df is not None and len(df) >0:
-        values=[]
-        for i in range(0, min(len(df), rows)):
-            values.append(["'"+str(i)+"'" if i and not isnan(i) else "NULL" for i in  df.iloc[i].values])
+        value_rows=[",\n".join(f"'{v}'" if v and not isnan(v) else "NULL" for v in df.iloc[i].values)
+                    for i in range(0, min(len(df), rows))]
         columns=df.columns
     else:
         raise Exception("no columns nor df given.")
 
-    return "\n".join([ "insert into "+tablename+" ("+ ",\n".join([i for i in  columns])+") values \n ("+ ",\n".join(val)+");" for val in values] )
+    cols_sql = ",\n".join(columns)
+    return "\n".join(f"insert into {tablename} ({cols_sql}) values \n ({vals});" for vals in value_rows)
 
-from datetime import datetime
+import time
 def get_now_timestamp():
-    return datetime.now().strftime('%Y%m%d_%H%M%S')
+    # equivalent of strftime('%Y%m%d_%H%M%S') without the per-call format
+    # scan and datetime allocation
+    t = time.localtime()
+    return f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}_{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}"
 
 
 import io
+import threading
+from collections import deque
 from contextlib import redirect_stdout
 
-def capture_stdout(func):
-    f = io.StringIO()
+_capture_buffers = threading.local()
+
+
+class _BoundedWriter:
+    '''File-like shim that keeps only the last maxlen write chunks.'''
+    def __init__(self, maxlen):
+        self.chunks = deque(maxlen=maxlen)
+
+    def write(self, s):
+        self.chunks.append(s)
+        return len(s)
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        return "".join(self.chunks)
+
+
+def capture_stdout(func, maxlen=None):
+    if maxlen is not None:
+        # bounded capture for chatty functions - keeps memory flat
+        f = _BoundedWriter(maxlen)
+    else:
+        # reuse one StringIO per thread instead of reallocating each call
+        f = getattr(_capture_buffers, "f", None)
+        if f is None:
+            f = _capture_buffers.f = io.StringIO()
+        else:
+            f.truncate(0)
+            f.seek(0)
     with redirect_stdout(f):
         res=func()
     stdout = f.getvalue()
@@ -44,10 +78,14 @@ import time
 
 
 def profile(func):
+    @functools.wraps(func)
     def wrap(*args, **kwargs):
-        started_at = time.time()
+        started_at = time.perf_counter()
         result = func(*args, **kwargs)
-        print("Profile func:"+func.__name__+" Time (sec):"+str(time.time() - started_at))
+        # %-style args so the message is only formatted when the logger is
+        # enabled
+        logger.info("Profile func:%s Time (sec):%.6f", func.__name__,
+                    time.perf_counter() - started_at)
         return result
 
     return wrap